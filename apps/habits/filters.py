@@ -0,0 +1,50 @@
+import re
+from datetime import date
+
+from django import forms
+from django_filters import rest_framework as filters
+
+from .models import HabitEntry
+
+_ISO_DATE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}")
+
+
+class ISODateField(forms.DateField):
+    """
+    DateField that parses YYYY-MM-DD with `date.fromisoformat`.
+
+    Only that exact form is accepted; the basic and week-date forms that
+    `fromisoformat` also understands are rejected.
+    """
+
+    def to_python(self, value):
+        if isinstance(value, str) and value not in self.empty_values:
+            value = value.strip()
+            try:
+                if not _ISO_DATE.fullmatch(value):
+                    raise ValueError(value)
+                return date.fromisoformat(value)
+            except ValueError:
+                raise forms.ValidationError(
+                    self.error_messages["invalid"], code="invalid"
+                ) from None
+        return super().to_python(value)
+
+
+class ISODateFilter(filters.DateFilter):
+    field_class = ISODateField
+
+
+class IntegerFilter(filters.NumberFilter):
+    field_class = forms.IntegerField
+
+
+class HabitEntryFilter(filters.FilterSet):
+    habit_id = IntegerFilter(field_name="habit__id")
+    start_date = ISODateFilter(field_name="entry_date", lookup_expr="gte")
+    end_date = ISODateFilter(field_name="entry_date", lookup_expr="lte")
+    date = ISODateFilter(field_name="entry_date")
+
+    class Meta:
+        model = HabitEntry
+        fields = ["habit_id", "start_date", "end_date", "date"]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2 on 2026-10-15 07:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habits', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='habit',
+            index=models.Index(fields=['user', 'archived_at', 'name'], name='habits_habi_user_id_8af4b7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='habitentry',
+            index=models.Index(fields=['user', 'habit', '-entry_date'], name='habits_habi_user_id_d0bda7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='habitentry',
+            index=models.Index(fields=['user', '-entry_date'], name='habits_habi_user_id_ff2256_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2 on 2026-10-15 09:40
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_habit_names(apps, schema_editor):
+    Habit = apps.get_model("habits", "Habit")
+    HabitEntry = apps.get_model("habits", "HabitEntry")
+    HabitEntry.objects.update(
+        habit_name=Subquery(
+            Habit.objects.filter(pk=OuterRef("habit_id")).values("name")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habits', '0002_habit_entry_user_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='habitentry',
+            options={'ordering': ['-entry_date', 'habit_name']},
+        ),
+        migrations.AddField(
+            model_name='habitentry',
+            name='habit_name',
+            field=models.CharField(default='', editable=False, max_length=100),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_habit_names, migrations.RunPython.noop),
+    ]
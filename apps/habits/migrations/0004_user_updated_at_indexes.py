@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-15 10:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habits', '0003_habitentry_habit_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='habit',
+            index=models.Index(fields=['user', 'updated_at'], name='habits_habi_user_id_bbc18b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='habitentry',
+            index=models.Index(fields=['user', 'updated_at'], name='habits_habi_user_id_d9aa0c_idx'),
+        ),
+    ]
@@ -33,6 +33,10 @@ class Habit(models.Model):
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            models.Index(fields=["user", "archived_at", "name"]),
+            models.Index(fields=["user", "updated_at"]),
+        ]
 
 
 class HabitEntry(models.Model):
@@ -46,6 +50,9 @@ class HabitEntry(models.Model):
         on_delete=models.CASCADE,
         related_name="habit_entries",
     )
+    # Copy of habit.name so entry lists can render it without a JOIN.
+    # Kept in sync by save() and the Habit post_save signal.
+    habit_name = models.CharField(max_length=100, editable=False)
     entry_date = models.DateField()
 
     value = models.PositiveIntegerField(default=1)
@@ -54,9 +61,22 @@ class HabitEntry(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return f"{self.habit.name} - {self.entry_date} ({self.value})"
+        return f"{self.habit_name} - {self.entry_date} ({self.value})"
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "habit" in update_fields:
+            self.habit_name = self.habit.name
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "habit_name"}
+        super().save(*args, **kwargs)
 
     class Meta:
-        ordering = ["-entry_date", "habit__name"]
+        ordering = ["-entry_date", "habit_name"]
         unique_together = [["habit", "entry_date"]]
-        indexes = [models.Index(fields=["habit", "entry_date"])]
+        indexes = [
+            models.Index(fields=["habit", "entry_date"]),
+            models.Index(fields=["user", "habit", "-entry_date"]),
+            models.Index(fields=["user", "-entry_date"]),
+            models.Index(fields=["user", "updated_at"]),
+        ]
@@ -0,0 +1,50 @@
+from django.contrib.auth import get_user_model
+from django.core.exceptions import EmptyResultSet
+from django.db import connection
+
+from .models import HabitEntry
+
+User = get_user_model()
+
+
+def _timestamp_json(column):
+    """SQL rendering a timestamptz the way DRF's DateTimeField does (UTC, 'Z')."""
+    return (
+        f"to_char({column} AT TIME ZONE 'UTC', 'YYYY-MM-DD\"T\"HH24:MI:SS')"
+        f" || CASE WHEN date_part('microseconds', {column})::integer %% 1000000 = 0"
+        f" THEN '' ELSE to_char({column} AT TIME ZONE 'UTC', '.US') END || 'Z'"
+    )
+
+
+def entries_json(queryset):
+    """
+    Render a HabitEntry queryset to a JSON array inside PostgreSQL.
+
+    Produces the same objects as `HabitEntrySerializer(many=True)`, ordered
+    newest first, so the list endpoint can return the string as-is instead of
+    serializing and encoding every row in Python.
+    """
+    try:
+        ids_sql, params = queryset.order_by().values("pk").query.sql_with_params()
+    except EmptyResultSet:
+        # Filters that can never match (e.g. an out-of-range id) compile to nothing.
+        return "[]"
+    sql = f"""
+        SELECT COALESCE(json_agg(json_build_object(
+            'id', e.id,
+            'user', u.{User._meta.get_field(User.USERNAME_FIELD).column},
+            'habit', e.habit_id,
+            'habit_name', e.habit_name,
+            'entry_date', e.entry_date,
+            'value', e.value,
+            'notes', e.notes,
+            'created_at', {_timestamp_json("e.created_at")},
+            'updated_at', {_timestamp_json("e.updated_at")}
+        ) ORDER BY e.entry_date DESC), '[]')::text
+        FROM {HabitEntry._meta.db_table} e
+        JOIN {User._meta.db_table} u ON u.{User._meta.pk.column} = e.user_id
+        WHERE e.id IN ({ids_sql})
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchone()[0]
@@ -1,12 +1,38 @@
+import copy
+from operator import attrgetter
+
 from django.contrib.auth import get_user_model
+from django.db import connection
+from drf_accelerator import FastSerializationMixin
+from drf_accelerator.mixins import FastListSerializer
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 
 from .models import Habit, HabitEntry
 
 User = get_user_model()
 
 
-class HabitSerializer(serializers.ModelSerializer):
+class CachedFieldsMixin:
+    """
+    Builds a ModelSerializer's fields once per class.
+
+    `get_fields()` introspects the model on every instantiation; the result
+    only depends on the class, so later instances get a deep copy instead.
+    """
+
+    def get_fields(self):
+        cls = type(self)
+        fields = cls.__dict__.get("_cached_fields")
+        if fields is None:
+            fields = super().get_fields()  # type: ignore
+            cls._cached_fields = fields
+        return copy.deepcopy(fields)
+
+
+class HabitSerializer(
+    FastSerializationMixin, CachedFieldsMixin, serializers.ModelSerializer
+):
     user = serializers.StringRelatedField(read_only=True)
 
     class Meta:
@@ -25,21 +51,106 @@ class HabitSerializer(serializers.ModelSerializer):
             "goal_unit",
         ]
         read_only_fields = ["user", "created_at", "updated_at"]
+        extra_kwargs = {
+            "name": {
+                "min_length": 3,
+                "error_messages": {
+                    "min_length": "Name must be at least 3 characters long."
+                },
+            }
+        }
 
-    def validate_name(self, value):
-        if not value:
-            raise serializers.ValidationError("Name is required.")
-        if len(value) < 3:
-            raise serializers.ValidationError(
-                "Name must be at least 3 characters long."
-            )
-        return value
 
+def _validate_singular_value(value):
+    if value != 1:
+        raise serializers.ValidationError("Singular habits can only have a value of 1.")
+
+
+def _validate_timed_value(value):
+    if value <= 0:
+        raise serializers.ValidationError("Timed habits must have a positive value.")
+
+
+# Entry value rules, dispatched on the habit's type.
+_VALUE_VALIDATORS = {
+    Habit.HabitType.SINGULAR: _validate_singular_value,
+    Habit.HabitType.TIMED: _validate_timed_value,
+}
+
+
+def _as_int(value):
+    """Coerce a submitted primary key to int, or None if it is not one."""
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _as_pk(value):
+    """Like `_as_int`, but also None for ints outside the primary key range."""
+    pk = _as_int(value)
+    low, high = connection.ops.integer_field_range("BigAutoField")
+    if pk is None or not low <= pk <= high:
+        return None
+    return pk
+
+
+class UserHabitPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Resolves habit PKs against the requesting user's active habits only.
+
+    When the serializer context carries a prefetched `habits` mapping (bulk
+    creates), PKs are resolved from it instead of querying per value.
+    """
+
+    default_error_messages = {
+        **serializers.PrimaryKeyRelatedField.default_error_messages,
+        "does_not_exist": "You can only create entries for your own active habits.",
+    }
+
+    def get_queryset(self):
+        request = self.context.get("request")
+        if request is None:
+            return Habit.objects.none()
+        return Habit.objects.filter(user=request.user, archived_at__isnull=True)
+
+    def to_internal_value(self, data):
+        habits = self.context.get("habits")
+        if habits is None:
+            return super().to_internal_value(data)
+        if _as_int(data) is None:
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        pk = _as_pk(data)
+        if pk not in habits:
+            self.fail("does_not_exist", pk_value=data)
+        return habits[pk]
 
-class HabitEntrySerializer(serializers.ModelSerializer):
+
+class HabitEntryListSerializer(FastListSerializer):
+    """
+    Fast list serializer that reads the habit PK from `habit_id`.
+
+    The accelerated path resolves relations with `getattr`, which would load
+    every entry's Habit row; the PK is already on the entry. This rewrites
+    drf-accelerator's internal field config, so the dependency is pinned to
+    its 0.1 series.
+    """
+
+    def _build_field_config(self):
+        return [
+            (name, source, "method", attrgetter("habit_id"))
+            if name == "habit"
+            else (name, source, kind, field)
+            for name, source, kind, field in super()._build_field_config()
+        ]
+
+
+class HabitEntrySerializer(CachedFieldsMixin, serializers.ModelSerializer):
     user = serializers.StringRelatedField(read_only=True)
-    habit = serializers.PrimaryKeyRelatedField(queryset=Habit.objects.all())
-    habit_name = serializers.CharField(source="habit.name", read_only=True)
+    habit = UserHabitPrimaryKeyRelatedField()
+    habit_name = serializers.CharField(read_only=True)
 
     class Meta:
         model = HabitEntry
@@ -56,39 +167,83 @@ class HabitEntrySerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["user", "created_at", "updated_at", "habit_name"]
 
-    def validate_habit(self, habit_instance):
-        request_user = self.context["request"].user
-        if habit_instance.user != request_user:
-            raise serializers.ValidationError(
-                "You can only create entries for your own habits."
-            )
-        if habit_instance.archived_at is not None:
-            raise serializers.ValidationError(
-                "Cannot create entries for archived habits."
-            )
-        return habit_instance
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        kwargs["child"] = cls(*args, **kwargs)
+        return HabitEntryListSerializer(*args, **kwargs)
+
+    def get_validators(self):
+        # Bulk creates check (habit, entry_date) uniqueness for the whole batch.
+        if "habits" in self.context:
+            return []
+        return super().get_validators()
 
     def validate(self, attrs):
         habit = attrs.get("habit", getattr(self.instance, "habit", None))
         value = attrs.get("value", getattr(self.instance, "value", None))
 
         if habit and value is not None:
-            if habit.type == Habit.HabitType.SINGULAR and value != 1:
-                raise serializers.ValidationError(
-                    "Singular habits can only have a value of 1."
-                )
-            # Use elif for clarity/safety
-            elif habit.type == Habit.HabitType.TIMED and value <= 0:
-                raise serializers.ValidationError(
-                    "Timed habits must have a positive value."
-                )
-            else:
-                pass
-        else:
-            pass
+            validate_value = _VALUE_VALIDATORS.get(habit.type)
+            if validate_value is not None:
+                validate_value(value)
 
         return attrs
 
     def create(self, validated_data):
         validated_data["user"] = self.context["request"].user
         return super().create(validated_data)
+
+
+class HabitEntryBulkSerializer(serializers.ListSerializer):
+    """
+    Validates and creates a batch of entries with a fixed number of queries.
+
+    Referenced habits are fetched in one query before the rows are validated,
+    (habit, entry_date) uniqueness is checked against the database and within
+    the batch in one more, and the entries are written with `bulk_create`.
+    """
+
+    unique_message = "The fields habit, entry_date must make a unique set."
+
+    def to_internal_value(self, data):
+        # Oversized batches are rejected by ListSerializer before any lookup.
+        if isinstance(data, list) and (
+            self.max_length is None or len(data) <= self.max_length
+        ):
+            habit_ids = {
+                _as_pk(row.get("habit")) for row in data if isinstance(row, dict)
+            }
+            habit_ids.discard(None)
+            self.context["habits"] = (
+                self.child.fields["habit"].get_queryset().in_bulk(habit_ids)
+            )
+
+        validated = super().to_internal_value(data)
+
+        pairs = [(attrs["habit"].pk, attrs["entry_date"]) for attrs in validated]
+        existing = set(
+            HabitEntry.objects.filter(
+                habit_id__in={habit_id for habit_id, _ in pairs},
+                entry_date__in={entry_date for _, entry_date in pairs},
+            ).values_list("habit_id", "entry_date")
+        )
+        seen = set()
+        errors = {}
+        for index, pair in enumerate(pairs):
+            if pair in existing or pair in seen:
+                errors[index] = {"non_field_errors": [self.unique_message]}
+            seen.add(pair)
+        if errors:
+            # Same shape as the per-row errors raised by ListSerializer.
+            if not getattr(api_settings, "LIST_SERIALIZER_ERRORS_AS_DICT", False):
+                errors = [errors.get(index, {}) for index in range(len(pairs))]
+            raise serializers.ValidationError(errors)
+
+        return validated
+
+    def create(self, validated_data):
+        user = self.context["request"].user
+        return HabitEntry.objects.bulk_create(
+            HabitEntry(user=user, habit_name=attrs["habit"].name, **attrs)
+            for attrs in validated_data
+        )
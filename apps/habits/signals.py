@@ -0,0 +1,16 @@
+# apps/habits/signals.py
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import Habit, HabitEntry
+
+
+@receiver(post_save, sender=Habit)
+def sync_entry_habit_names(sender, instance, created, update_fields, **kwargs):
+    """Copy a renamed habit's name onto its entries' denormalized habit_name."""
+    if created or (update_fields is not None and "name" not in update_fields):
+        return
+    HabitEntry.objects.filter(habit=instance).exclude(habit_name=instance.name).update(
+        habit_name=instance.name
+    )
@@ -1,14 +1,19 @@
 # apps/habits/tests.py
 
+import json
 from datetime import date, timedelta
+from unittest import skipUnless
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
 from django.urls import reverse
 from django.utils import timezone  # Import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 
 from .models import Habit, HabitEntry
+from .serializers import HabitEntrySerializer
 
 User = get_user_model()
 
@@ -18,6 +23,7 @@ class HabitAPITest(APITestCase):
 
     def setUp(self):
         """Set up test users and URLs."""
+        cache.clear()
         # User 1 (will own the habits being tested)
         self.user1 = User.objects.create_user(
             username="habituser1",
@@ -74,6 +80,16 @@ class HabitAPITest(APITestCase):
         self.assertIn(self.habit1_user1.name, habit_names)
         self.assertIn(self.habit2_user1.name, habit_names)
 
+    def test_list_habits_no_per_row_queries(self):
+        """Ensure listing habits does not issue a query per row for the user."""
+        self.client.force_authenticate(user=self.user1)
+        # One cache version query plus the habits query
+        with self.assertNumQueries(2):
+            response = self.client.get(self.habit_list_create_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]["user"], self.user1.username)
+
     def test_list_habits_unauthenticated(self):
         response = self.client.get(self.habit_list_create_url)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -121,6 +137,16 @@ class HabitAPITest(APITestCase):
         data = {"name": "A", "type": "singular"}  # Name too short
         response = self.client.post(self.habit_list_create_url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data["name"], ["Name must be at least 3 characters long."]
+        )
+
+    def test_create_habit_blank_name(self):
+        self.client.force_authenticate(user=self.user1)
+        data = {"name": "", "type": "singular"}
+        response = self.client.post(self.habit_list_create_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["name"][0].code, "blank")
 
     # --- Retrieve Tests ---
 
@@ -291,6 +317,7 @@ class HabitEntryAPITest(APITestCase):
 
     def setUp(self):
         """Set up users, habits, entries, and URLs."""
+        cache.clear()
         # Users
         self.user1 = User.objects.create_user(
             "entryuser1", "entry1@example.com", "StrongPass123"
@@ -351,8 +378,8 @@ class HabitEntryAPITest(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         # User 1 has 3 entries
-        self.assertEqual(len(response.data), 3)
-        entry_ids = {item["id"] for item in response.data}
+        self.assertEqual(len(response.json()), 3)
+        entry_ids = {item["id"] for item in response.json()}
         self.assertIn(self.entry1.pk, entry_ids)
         self.assertIn(self.entry2.pk, entry_ids)
         self.assertIn(self.entry3.pk, entry_ids)
@@ -360,6 +387,97 @@ class HabitEntryAPITest(APITestCase):
             self.entry_u2.pk, entry_ids
         )  # Ensure user 2's entry isn't listed
 
+    def test_list_entries_no_per_row_queries(self):
+        """Ensure listing entries does not issue a query per row for habit/user."""
+        self.client.force_authenticate(user=self.user1)
+        # Two cache version queries (entries, habits) plus the entries query
+        with self.assertNumQueries(3):
+            response = self.client.get(self.entry_list_create_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()), 3)
+        self.assertEqual(response.json()[0]["user"], self.user1.username)
+
+    def test_list_entries_stream(self):
+        """Test streaming the filtered entry list as a JSON array."""
+        self.client.force_authenticate(user=self.user1)
+        url = f"{self.entry_list_create_url}?stream=true&habit_id={self.habit_s_u1.pk}"
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        entries = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(
+            [item["id"] for item in entries], [self.entry3.pk, self.entry1.pk]
+        )
+        self.assertEqual(entries[0]["habit_name"], self.habit_s_u1.name)
+
+    def test_list_entries_cached(self):
+        """Ensure repeated list requests are served from the cache."""
+        self.client.force_authenticate(user=self.user1)
+        first = self.client.get(self.entry_list_create_url)
+        with self.assertNumQueries(2):  # Cache version queries only
+            second = self.client.get(self.entry_list_create_url)
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.json(), first.json())
+
+    def test_list_entries_cache_invalidated_on_write(self):
+        """Ensure cached entry lists reflect deletes and habit renames."""
+        self.client.force_authenticate(user=self.user1)
+        self.client.get(self.entry_list_create_url)
+
+        self.entry2.delete()
+        self.habit_s_u1.name = "Meditate Daily"
+        self.habit_s_u1.save()
+        response = self.client.get(self.entry_list_create_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        entries = response.json()
+        self.assertNotIn(self.entry2.pk, {item["id"] for item in entries})
+        self.assertEqual({item["habit_name"] for item in entries}, {"Meditate Daily"})
+
+    def test_list_entries_cache_invalidated_on_username_change(self):
+        """Ensure cached entry lists reflect a change to the owner's username."""
+        self.client.force_authenticate(user=self.user1)
+        self.client.get(self.entry_list_create_url)
+
+        self.user1.username = "renamed"
+        self.user1.save()
+        response = self.client.get(self.entry_list_create_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual({item["user"] for item in response.json()}, {"renamed"})
+
+    @skipUnless(connection.vendor == "postgresql", "PostgreSQL-only list path")
+    def test_list_entries_matches_serializer(self):
+        """Ensure the database-rendered list matches HabitEntrySerializer output."""
+        self.client.force_authenticate(user=self.user1)
+        response = self.client.get(self.entry_list_create_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        queryset = HabitEntry.objects.filter(user=self.user1).order_by("-entry_date")
+        expected = HabitEntrySerializer(queryset, many=True).data
+        self.assertCountEqual(response.json(), json.loads(json.dumps(expected)))
+
+    def test_list_entries_habit_name_follows_rename(self):
+        """Ensure renaming a habit updates the habit_name of its entries."""
+        self.client.force_authenticate(user=self.user1)
+        response = self.client.patch(
+            reverse("habit-detail", kwargs={"pk": self.habit_s_u1.pk}),
+            {"name": "Breathe"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(
+            self.entry_list_create_url, {"habit_id": self.habit_s_u1.pk}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {entry["habit_name"] for entry in response.json()}, {"Breathe"}
+        )
+
     def test_list_entries_unauthenticated(self):
         """Ensure unauthenticated user gets 401."""
         response = self.client.get(self.entry_list_create_url)
@@ -373,8 +491,10 @@ class HabitEntryAPITest(APITestCase):
         response = self.client.get(url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)  # entry1 and entry3 are for habit_s_u1
-        entry_ids = {item["id"] for item in response.data}
+        self.assertEqual(
+            len(response.json()), 2
+        )  # entry1 and entry3 are for habit_s_u1
+        entry_ids = {item["id"] for item in response.json()}
         self.assertIn(self.entry1.pk, entry_ids)
         self.assertIn(self.entry3.pk, entry_ids)
 
@@ -386,8 +506,8 @@ class HabitEntryAPITest(APITestCase):
         response = self.client.get(url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)  # entry1 and entry2 were yesterday
-        entry_ids = {item["id"] for item in response.data}
+        self.assertEqual(len(response.json()), 2)  # entry1 and entry2 were yesterday
+        entry_ids = {item["id"] for item in response.json()}
         self.assertIn(self.entry1.pk, entry_ids)
         self.assertIn(self.entry2.pk, entry_ids)
 
@@ -399,8 +519,35 @@ class HabitEntryAPITest(APITestCase):
         response = self.client.get(url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["id"], self.entry3.pk)
+        self.assertEqual(len(response.json()), 1)
+        self.assertEqual(response.json()[0]["id"], self.entry3.pk)
+
+    def test_list_entries_invalid_filter(self):
+        """Ensure malformed filter values are rejected instead of ignored."""
+        self.client.force_authenticate(user=self.user1)
+        url = f"{self.entry_list_create_url}?habit_id=abc&start_date=not-a-date"
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("habit_id", response.data)
+        self.assertIn("start_date", response.data)
+
+        response = self.client.get(
+            self.entry_list_create_url, {"habit_id": f"{self.habit_s_u1.pk}.7"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("habit_id", response.data)
+
+        # Out-of-range ids match nothing rather than erroring
+        response = self.client.get(self.entry_list_create_url, {"habit_id": 10**25})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), [])
+
+        # Only YYYY-MM-DD is accepted, not the other ISO 8601 date forms
+        for value in ("20240101", "2024W011", "2024-W01-1"):
+            response = self.client.get(self.entry_list_create_url, {"date": value})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("date", response.data)
 
     # --- Create Tests ---
 
@@ -463,10 +610,24 @@ class HabitEntryAPITest(APITestCase):
             "value": 1,
         }
         response = self.client.post(self.entry_list_create_url, data, format="json")
-        # Should fail validation in the serializer (validate_habit)
+        # Should fail the scoped habit lookup in the serializer
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("habit", response.data)  # Error should be tied to habit field
 
+    def test_create_entry_archived_habit(self):
+        """Ensure user cannot create entry for one of their archived habits."""
+        self.habit_t_u1.archived_at = timezone.now()
+        self.habit_t_u1.save()
+        self.client.force_authenticate(user=self.user1)
+        data = {
+            "habit": self.habit_t_u1.pk,
+            "entry_date": self.tomorrow.isoformat(),
+            "value": 30,
+        }
+        response = self.client.post(self.entry_list_create_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("habit", response.data)
+
     def test_create_entry_duplicate(self):
         """Ensure duplicate entry (same habit, same date) is not allowed."""
         self.client.force_authenticate(user=self.user1)
@@ -514,6 +675,142 @@ class HabitEntryAPITest(APITestCase):
             "non_field_errors", response.data
         )  # Based on current validate method
 
+    # --- Bulk Create Tests ---
+
+    def test_bulk_create_entries_success(self):
+        """Test creating several entries in one request with a fixed query count."""
+        self.client.force_authenticate(user=self.user1)
+        url = reverse("habitentry-bulk")
+        data = [
+            {
+                "habit": self.habit_s_u1.pk,
+                "entry_date": self.tomorrow.isoformat(),
+                "value": 1,
+            },
+            {
+                "habit": self.habit_t_u1.pk,
+                "entry_date": self.tomorrow.isoformat(),
+                "value": 45,
+                "notes": "Long session",
+            },
+            {
+                "habit": self.habit_t_u1.pk,
+                "entry_date": (self.tomorrow + timedelta(days=1)).isoformat(),
+                "value": 20,
+            },
+        ]
+        # Habits lookup, uniqueness check, and one bulk INSERT
+        with self.assertNumQueries(3):
+            response = self.client.post(url, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 3)
+        self.assertEqual(response.data[1]["habit_name"], self.habit_t_u1.name)
+        self.assertEqual(response.data[1]["user"], self.user1.username)
+        self.assertEqual(HabitEntry.objects.filter(user=self.user1).count(), 6)
+
+    def test_bulk_create_entries_invalid_rows(self):
+        """Ensure an invalid row rejects the whole batch with per-row errors."""
+        self.client.force_authenticate(user=self.user1)
+        url = reverse("habitentry-bulk")
+        data = [
+            {  # Valid
+                "habit": self.habit_s_u1.pk,
+                "entry_date": self.tomorrow.isoformat(),
+                "value": 1,
+            },
+            {  # Another user's habit
+                "habit": self.habit_s_u2.pk,
+                "entry_date": self.tomorrow.isoformat(),
+                "value": 1,
+            },
+        ]
+        response = self.client.post(url, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("habit", response.data[1])
+        self.assertEqual(HabitEntry.objects.filter(user=self.user1).count(), 3)
+
+    def test_bulk_create_entries_out_of_range_habit(self):
+        """Ensure a habit id beyond the primary key range is rejected per row."""
+        self.client.force_authenticate(user=self.user1)
+        url = reverse("habitentry-bulk")
+        data = [
+            {
+                "habit": 10**25,
+                "entry_date": self.tomorrow.isoformat(),
+                "value": 1,
+            }
+        ]
+        response = self.client.post(url, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0]["habit"][0].code, "does_not_exist")
+        self.assertEqual(HabitEntry.objects.filter(user=self.user1).count(), 3)
+
+    def test_bulk_create_entries_too_many(self):
+        """Ensure a batch over the size limit is rejected without querying."""
+        self.client.force_authenticate(user=self.user1)
+        url = reverse("habitentry-bulk")
+        data = [
+            {
+                "habit": self.habit_t_u1.pk,
+                "entry_date": (self.tomorrow + timedelta(days=offset)).isoformat(),
+                "value": 10,
+            }
+            for offset in range(501)
+        ]
+        with self.assertNumQueries(0):
+            response = self.client.post(url, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["non_field_errors"][0].code, "max_length")
+        self.assertEqual(HabitEntry.objects.filter(user=self.user1).count(), 3)
+
+    def test_bulk_create_entries_malformed_json(self):
+        """Ensure a body that is not valid JSON is rejected with a parse error."""
+        self.client.force_authenticate(user=self.user1)
+        url = reverse("habitentry-bulk")
+        response = self.client.post(
+            url, '[{"habit": 1,', content_type="application/json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(response.data["detail"].startswith("JSON parse error"))
+
+    def test_bulk_create_entries_duplicates(self):
+        """Ensure duplicates against existing entries and within the batch fail."""
+        self.client.force_authenticate(user=self.user1)
+        url = reverse("habitentry-bulk")
+        data = [
+            {  # Same habit/date as entry1
+                "habit": self.habit_s_u1.pk,
+                "entry_date": self.yesterday.isoformat(),
+                "value": 1,
+            },
+            {
+                "habit": self.habit_t_u1.pk,
+                "entry_date": self.tomorrow.isoformat(),
+                "value": 10,
+            },
+            {  # Repeats the previous row
+                "habit": self.habit_t_u1.pk,
+                "entry_date": self.tomorrow.isoformat(),
+                "value": 15,
+            },
+        ]
+        response = self.client.post(url, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        # Errors are keyed by row index (a list on older DRF versions)
+        errors = response.data
+        if isinstance(errors, list):
+            errors = dict(enumerate(errors))
+        self.assertIn("non_field_errors", errors[0])
+        self.assertFalse(errors.get(1))
+        self.assertIn("non_field_errors", errors[2])
+        self.assertEqual(HabitEntry.objects.filter(user=self.user1).count(), 3)
+
     def test_retrieve_entry_success(self):
         """Ensure user can retrieve their own entry."""
         self.client.force_authenticate(user=self.user1)
@@ -1,12 +1,90 @@
+import hashlib
+from itertools import batched
+
+import orjson
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count, Max
+from django.http import HttpResponse, StreamingHttpResponse
 from django.utils import timezone
+from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
-from rest_framework import permissions, viewsets
+from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from .filters import HabitEntryFilter
 from .models import Habit, HabitEntry
-from .serializers import HabitEntrySerializer, HabitSerializer
+from .queries import entries_json
+from .serializers import (
+    HabitEntryBulkSerializer,
+    HabitEntrySerializer,
+    HabitSerializer,
+)
+
+_TRUE_VALUES = frozenset({"true", "1"})
+_FALSE_VALUES = frozenset({"false", "0"})
+_STREAM_CHUNK_SIZE = 1000
+_BULK_MAX_ENTRIES = 500
+
+# Columns read by the serializers; related rows are trimmed to what they render.
+_HABIT_COLUMNS = (
+    "id",
+    "user__username",
+    "name",
+    "description",
+    "type",
+    "created_at",
+    "updated_at",
+    "archived_at",
+    "color",
+    "goal_value",
+    "goal_unit",
+)
+_ENTRY_COLUMNS = (
+    "id",
+    "user__username",
+    "habit",
+    "habit_name",
+    "entry_date",
+    "value",
+    "notes",
+    "created_at",
+    "updated_at",
+)
+
+
+def _list_cache_key(prefix, request, *querysets):
+    """
+    Cache key for a user's list response.
+
+    Includes the query parameters, the username rendered in every row, and the
+    latest `updated_at` and row count of each queryset the response depends on,
+    so any write produces a new key.
+    """
+    versions = [
+        tuple(qs.aggregate(Max("updated_at"), Count("pk")).values()) for qs in querysets
+    ]
+    raw = (
+        f"{sorted(request.query_params.lists())}:"
+        f"{request.user.get_username()}:{versions}"
+    )
+    return f"{prefix}:{request.user.pk}:{hashlib.md5(raw.encode()).hexdigest()}"
+
+
+def _stream_json_array(queryset, to_representation):
+    """Yield a queryset as a JSON array, encoding one iterator chunk at a time."""
+    yield b"["
+    separator = b""
+    for rows in batched(
+        queryset.iterator(chunk_size=_STREAM_CHUNK_SIZE), _STREAM_CHUNK_SIZE
+    ):
+        yield separator + b",".join(
+            orjson.dumps(to_representation(row)) for row in rows
+        )
+        separator = b","
+    yield b"]"
 
 
 class IsOwner(permissions.BasePermission):
@@ -68,17 +146,20 @@ class HabitViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):  # type: ignore
         user = self.request.user
-        queryset = Habit.objects.filter(user=user)
+        queryset = (
+            Habit.objects.select_related("user").only(*_HABIT_COLUMNS).filter(user=user)
+        )
 
         if self.action == "list":
             is_archived_param = self.request.query_params.get("archived")  # type: ignore
-            if is_archived_param is not None:
-                if is_archived_param.lower() in ["true", "1"]:
+            if is_archived_param is None:
+                queryset = queryset.filter(archived_at__isnull=True)
+            else:
+                is_archived_param = is_archived_param.lower()
+                if is_archived_param in _TRUE_VALUES:
                     queryset = queryset.filter(archived_at__isnull=False)
-                elif is_archived_param.lower() in ["false", "0"]:
+                elif is_archived_param in _FALSE_VALUES:
                     queryset = queryset.filter(archived_at__isnull=True)
-            else:
-                queryset = queryset.filter(archived_at__isnull=True)
 
         return queryset.order_by("name")
 
@@ -97,7 +178,14 @@ class HabitViewSet(viewsets.ModelViewSet):
         Use query parameter `?archived=true` to list only archived habits.
         Use query parameter `?archived=false` to explicitly list only active habits.
         """
-        return super().list(request, *args, **kwargs)
+        key = _list_cache_key(
+            "habits", request, Habit.objects.filter(user=request.user)
+        )
+        data = cache.get(key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(key, data)
+        return Response(data)
 
     def create(self, request, *args, **kwargs):
         """
@@ -165,7 +253,7 @@ class HabitViewSet(viewsets.ModelViewSet):
         habit = self.get_object()
         if habit.archived_at is None:
             habit.archived_at = timezone.now()
-            habit.save()
+            habit.save(update_fields=["archived_at", "updated_at"])
         serializer = self.get_serializer(habit)
         return Response(serializer.data)
 
@@ -187,7 +275,7 @@ class HabitViewSet(viewsets.ModelViewSet):
         habit = self.get_object()
         if habit.archived_at is not None:
             habit.archived_at = None
-            habit.save()
+            habit.save(update_fields=["archived_at", "updated_at"])
         serializer = self.get_serializer(habit)
         return Response(serializer.data)
 
@@ -226,6 +314,13 @@ class HabitViewSet(viewsets.ModelViewSet):
                 description="Filter entries for specific date (YYYY-MM-DD)",
                 required=False,
             ),
+            OpenApiParameter(
+                name="stream",
+                type=OpenApiTypes.BOOL,
+                location=OpenApiParameter.QUERY,
+                description="Stream the full result as a JSON array, bypassing the cache",
+                required=False,
+            ),
         ],
     ),
     create=extend_schema(
@@ -266,46 +361,27 @@ class HabitEntryViewSet(viewsets.ModelViewSet):
 
     serializer_class = HabitEntrySerializer
     permission_classes = [permissions.IsAuthenticated, IsOwner]
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = HabitEntryFilter
 
     def get_queryset(self):  # type: ignore
         """
-        Dynamically filters the queryset based on query parameters.
+        Restricts entries to the authenticated user.
 
-        - Restricts entries to the authenticated user.
-        - Filters by `habit_id` if provided.
-        - Filters by date range (`start_date`, `end_date`) if provided.
-        - Filters by specific `date` if provided.
+        Query parameter filtering (`habit_id`, `start_date`, `end_date`, `date`)
+        is applied by `HabitEntryFilter` through the filter backend.
         """
-        user = self.request.user
-        queryset = HabitEntry.objects.filter(user=user)
-
-        habit_id = self.request.query_params.get("habit_id")  # type: ignore
-        if habit_id:
-            try:
-                queryset = queryset.filter(habit__id=int(habit_id))
-            except (ValueError, TypeError):
-                pass
-
-        start_date = self.request.query_params.get("start_date")  # type: ignore
-        end_date = self.request.query_params.get("end_date")  # type: ignore
-
-        if start_date:
-            queryset = queryset.filter(entry_date__gte=start_date)
-        if end_date:
-            queryset = queryset.filter(entry_date__lte=end_date)
-
-        specific_date = self.request.query_params.get("date")  # type: ignore
-        if specific_date:
-            queryset = queryset.filter(entry_date=specific_date)
+        if getattr(self, "swagger_fake_view", False):
+            return HabitEntry.objects.none()
 
+        user = self.request.user
+        queryset = (
+            HabitEntry.objects.select_related("user")
+            .only(*_ENTRY_COLUMNS)
+            .filter(user=user)
+        )
         return queryset.order_by("-entry_date")
 
-    def get_serializer_context(self):
-        """Pass request context to the serializer for validation."""
-        context = super().get_serializer_context()
-        context["request"] = self.request
-        return context
-
     def list(self, request, *args, **kwargs):
         """
         List Habit Entries for the authenticated user.
@@ -315,8 +391,42 @@ class HabitEntryViewSet(viewsets.ModelViewSet):
         - `start_date=YYYY-MM-DD`: Filter by entries on or after this date.
         - `end_date=YYYY-MM-DD`: Filter by entries on or before this date.
         - `date=YYYY-MM-DD`: Filter by entries on a specific date.
+
+        - `stream=true`: Stream the result instead of building it in memory.
+
+        On PostgreSQL, JSON responses are built by the database in one query.
+        Responses are cached until the user's entries or habits change.
         """
-        return super().list(request, *args, **kwargs)
+        stream = request.query_params.get("stream")  # type: ignore
+        if stream is not None and stream.lower() in _TRUE_VALUES:
+            queryset = self.filter_queryset(self.get_queryset())
+            return StreamingHttpResponse(
+                _stream_json_array(queryset, self.get_serializer().to_representation),
+                content_type="application/json",
+            )
+
+        dependencies = (
+            HabitEntry.objects.filter(user=request.user),
+            Habit.objects.filter(user=request.user),
+        )
+        if (
+            connection.vendor == "postgresql"
+            and self.paginator is None
+            and request.accepted_renderer.format == "json"
+        ):
+            key = _list_cache_key("entries-json", request, *dependencies)
+            content = cache.get(key)
+            if content is None:
+                content = entries_json(self.filter_queryset(self.get_queryset()))
+                cache.set(key, content)
+            return HttpResponse(content, content_type="application/json")
+
+        key = _list_cache_key("entries", request, *dependencies)
+        data = cache.get(key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(key, data)
+        return Response(data)
 
     def create(self, request, *args, **kwargs):
         """
@@ -335,6 +445,34 @@ class HabitEntryViewSet(viewsets.ModelViewSet):
         """
         return super().create(request, *args, **kwargs)
 
+    @extend_schema(
+        tags=["Entries"],
+        summary="Bulk create habit entries",
+        description="Log several habit completions in one request.",
+        request=HabitEntrySerializer(many=True),
+        responses={201: HabitEntrySerializer(many=True)},
+    )
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        """
+        Create several Habit Entries at once.
+
+        Accepts a list of objects with the same fields as `create`. The batch is
+        all-or-nothing: if any entry is invalid, nothing is created and the
+        response lists the errors per entry, in request order. At most 500
+        entries can be sent per request.
+        """
+        serializer = HabitEntryBulkSerializer(
+            child=HabitEntrySerializer(),
+            data=request.data,
+            allow_empty=False,
+            max_length=_BULK_MAX_ENTRIES,
+            context=self.get_serializer_context(),
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
     def retrieve(self, request, *args, **kwargs):
         """
         Retrieve the details of a specific Habit Entry by its ID.
@@ -0,0 +1,25 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson.
+
+    Encodes response data straight to bytes in C. Types orjson does not know
+    (lazy strings, querysets, etc.) fall back to DRF's own encoder. Requested
+    indentation (e.g. from the browsable API) is rendered with two spaces, the
+    only width orjson supports.
+    """
+
+    _fallback_encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        # DRF keys list serializer errors by row index, so allow non-str keys.
+        option = orjson.OPT_NON_STR_KEYS
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=self._fallback_encoder.default, option=option)